@@ -15,10 +15,32 @@ Usage:
 import json
 import datetime
 import os
-import subprocess
-import shutil
+import re
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import orjson  # Optional: much faster parsing of large benchmark files
+except ImportError:
+    orjson = None
+
+# Run filenames: {optimization}_run{NN}_{YYYYmmdd_HHMMSS}_{commit}.json
+_RUN_FILENAME_RE = re.compile(
+    r"^(?P<name>.+?)_(?P<run>run\d+)_(?P<timestamp>\d{8}_\d{6})_(?P<commit>[0-9A-Za-z-]+)$"
+)
+
+# Bump whenever the shape of cached run entries (_index_run output) changes
+_INDEX_CACHE_VERSION = 1
+
+def _load_json(path) -> Any:
+    """Parse a JSON file in one read, using orjson when it is installed"""
+    raw = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 # ANSI color codes
 class Colors:
@@ -31,12 +53,66 @@ class Colors:
     BOLD = '\033[1m'
     RESET = '\033[0m'
 
+_COLOR_NAMES = ("RED", "GREEN", "YELLOW", "BLUE", "GRAY", "WHITE", "BOLD", "RESET")
+_CHANGE_COLOR_NAMES = ("GRAY", "GREEN", "YELLOW", "RED", "BLUE")
+
+class _Palette:
+    """Colour codes plus fixed-width cell templates, blank when colour is off"""
+    def __init__(self, enabled: bool):
+        for name in _COLOR_NAMES:
+            setattr(self, name, getattr(Colors, name) if enabled else "")
+        
+        # Fixed-width cell templates with the colour codes baked in once
+        self.value_cell = self.WHITE + "{:>12}" + self.RESET
+        self.value_cell_1f = self.WHITE + "{:>12.1f}" + self.RESET
+        self.change_cells = {
+            name: getattr(self, name) + "{:>18}" + self.RESET for name in _CHANGE_COLOR_NAMES
+        }
+
+_COLOR_PALETTE = _Palette(enabled=True)
+_PLAIN_PALETTE = _Palette(enabled=False)
+
+def _stream_supports_color(stream) -> bool:
+    """Whether to colour output written to stream (honours NO_COLOR and FORCE_COLOR)"""
+    if os.environ.get("NO_COLOR"):
+        return False
+    force_color = os.environ.get("FORCE_COLOR")
+    if force_color:
+        return force_color.lower() not in ("0", "false")
+    return hasattr(stream, "isatty") and stream.isatty()
+
+@dataclass
+class RunSummary:
+    """Summary of a collected benchmark run"""
+    # Explicit slots rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = (
+        "file_path", "optimization_name", "run_number", "timestamp", "git_commit",
+        "device_model", "device_brand", "android_sdk", "benchmark_count", "benchmark_names"
+    )
+    
+    file_path: str
+    optimization_name: str
+    run_number: int
+    timestamp: str
+    git_commit: str
+    device_model: str
+    device_brand: str
+    android_sdk: int
+    benchmark_count: int
+    benchmark_names: Tuple[str, ...]
+
 class OptimizationTracker:
     def __init__(self, results_dir: str = "benchmark_results"):
         self.results_dir = Path(results_dir)
         self.results_dir.mkdir(exist_ok=True)
+        self.index_cache_file = self.results_dir / ".index_cache.json"
+        self._git_commit: Optional[str] = None
+        # Decided per stream: the table goes to stdout, warnings to stderr
+        self._use_color = _stream_supports_color(sys.stdout)
+        self._colors = _COLOR_PALETTE if self._use_color else _PLAIN_PALETTE
+        self._err_colors = _COLOR_PALETTE if _stream_supports_color(sys.stderr) else _PLAIN_PALETTE
     
-    def collect_run(self, optimization_name: str, benchmark_json_path: str) -> Dict[str, Any]:
+    def collect_run(self, optimization_name: str, benchmark_json_path: str) -> RunSummary:
         """Collect a new benchmark run for the optimization"""
         if not Path(benchmark_json_path).exists():
             raise FileNotFoundError(f"Benchmark file not found: {benchmark_json_path}")
@@ -46,7 +122,8 @@ class OptimizationTracker:
         optimization_dir.mkdir(exist_ok=True)
         
         # Generate filename with run number
-        existing_runs = len(list(optimization_dir.glob("*.json")))
+        with os.scandir(optimization_dir) as entries:
+            existing_runs = sum(1 for entry in entries if entry.name.endswith('.json') and entry.is_file())
         run_number = existing_runs + 1
         
         git_commit = self._get_git_commit()
@@ -57,22 +134,26 @@ class OptimizationTracker:
         destination_path = optimization_dir / filename
         
         # Copy benchmark file
+        import shutil
         shutil.copy2(benchmark_json_path, destination_path)
         
         # Load and parse the benchmark data for summary
-        with open(benchmark_json_path) as f:
-            benchmark_data = json.load(f)
-        
-        result_summary = {
-            "file_path": str(destination_path),
-            "optimization_name": optimization_name,
-            "run_number": run_number,
-            "timestamp": timestamp,
-            "git_commit": git_commit,
-            "device_context": self._extract_device_context(benchmark_data),
-            "benchmark_count": len(benchmark_data.get("benchmarks", [])),
-            "benchmark_names": [b.get("name", "unknown") for b in benchmark_data.get("benchmarks", [])]
-        }
+        benchmark_data = _load_json(benchmark_json_path)
+        
+        device_context = self._extract_device_context(benchmark_data)
+        benchmarks = benchmark_data.get("benchmarks", [])
+        result_summary = RunSummary(
+            file_path=str(destination_path),
+            optimization_name=optimization_name,
+            run_number=run_number,
+            timestamp=timestamp,
+            git_commit=git_commit,
+            device_model=device_context["device_model"],
+            device_brand=device_context["device_brand"],
+            android_sdk=device_context["android_version"],
+            benchmark_count=len(benchmarks),
+            benchmark_names=tuple(b.get("name", "unknown") for b in benchmarks)
+        )
         
         self._print_collection_summary(result_summary, existing_runs)
         
@@ -85,26 +166,44 @@ class OptimizationTracker:
             print(f"❌ No optimization folder found: {optimization_name}")
             return
         
-        # Get all JSON files sorted by creation time
-        json_files = sorted(optimization_dir.glob("*.json"), key=lambda x: x.stat().st_mtime)
-        if not json_files:
+        # Get all JSON files sorted by modification time
+        runs = self._scan_runs(optimization_dir)
+        if not runs:
             print(f"📭 No benchmark files found in {optimization_name}")
             return
         
-        print(f"\n{Colors.BOLD}Optimization Progress: {optimization_name}{Colors.RESET}")
+        print(f"\n{self._colors.BOLD}Optimization Progress: {optimization_name}{self._colors.RESET}")
         print("=" * 100)
         
-        # Load all benchmark data
+        # Load all benchmark data, reusing cached indexes for unchanged files
+        index_cache = self._load_index_cache()
+        cache_dirty = False
         run_data = []
-        for json_file in json_files:
-            try:
-                with open(json_file) as f:
-                    data = json.load(f)
-                    data['_file_name'] = json_file.name
-                    run_data.append(data)
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"⚠️  Warning: Could not load {json_file.name}: {e}")
-                continue
+        for file_name, mtime_ns, size in runs:
+            json_file = optimization_dir / file_name
+            cache_key = f"{optimization_name}/{file_name}"
+            cached_mtime_ns, cached_size, cached = index_cache.get(cache_key, (None, None, None))
+            if cached is None or (cached_mtime_ns, cached_size) != (mtime_ns, size):
+                try:
+                    data = _load_json(json_file)
+                except (json.JSONDecodeError, IOError) as e:
+                    print(f"⚠️  Warning: Could not load {json_file.name}: {e}")
+                    continue
+                cached = {
+                    "context": data.get("context", {}),
+                    "metric_index": self._index_run(data)
+                }
+                index_cache[cache_key] = (mtime_ns, size, cached)
+                cache_dirty = True
+            
+            run_data.append({
+                "_file_name": file_name,
+                "context": cached["context"],
+                "_metric_index": cached["metric_index"]
+            })
+        
+        if cache_dirty:
+            self._save_index_cache(index_cache)
         
         if not run_data:
             print("❌ No valid benchmark data found")
@@ -113,9 +212,8 @@ class OptimizationTracker:
         # Check device consistency and show warning if needed
         self._check_device_consistency(run_data)
         
-        # Extract all metrics from first run to establish structure
-        first_run = run_data[0]
-        all_metrics = self._extract_all_metrics_from_run(first_run)
+        # Establish structure from the baseline run plus metrics added later
+        all_metrics = self._extract_all_metrics(run_data)
         
         if not all_metrics:
             print("❌ No metrics found in benchmark data")
@@ -124,24 +222,27 @@ class OptimizationTracker:
         # Filter metrics if requested
         if not show_all_metrics:
             # Show only time metrics by default (most important for optimization)
-            time_metrics = {k: v for k, v in all_metrics.items() if k.endswith('SumMs')}
+            time_metrics = {k: v for k, v in all_metrics.items() if v[1]}
             if time_metrics:
                 all_metrics = time_metrics
         
-        # Print header with fixed spacing
+        # Buffer the whole table and emit it with a single write
+        out_lines = []
+        
+        # Header with fixed spacing
         header_parts = [f"{'Metric':<50}"]
         for i, data in enumerate(run_data):
             header_parts.append(f"{'Run' + str(i+1):>12}")
             if i > 0:
                 header_parts.append(f"{'Change':>18}")
-        print("".join(header_parts))
+        out_lines.append("".join(header_parts))
         
-        # Print separator
+        # Separator
         separator_length = 50 + len(run_data) * 12 + (len(run_data) - 1) * 18
-        print("-" * separator_length)
+        out_lines.append("-" * separator_length)
         
-        # Print each metric
-        for metric_name, (benchmark_name, _) in all_metrics.items():
+        # Each metric
+        for metric_name, (benchmark_name, is_time) in all_metrics.items():
             display_name = metric_name
             if len(display_name) > 48:
                 display_name = display_name[:45] + "..."
@@ -149,27 +250,39 @@ class OptimizationTracker:
             # Start with metric name
             row_parts = [f"{display_name:<50}"]
             
-            # Get baseline value (first run)
-            baseline_value = self._get_metric_value(run_data[0], benchmark_name, metric_name)
+            # Resolve the whole row up front; the first run is the baseline
+            metric_key = (benchmark_name, metric_name)
+            row_values = [data["_metric_index"].get(metric_key) for data in run_data]
+            baseline_value = row_values[0]
             
-            for i, data in enumerate(run_data):
-                current_value = self._get_metric_value(data, benchmark_name, metric_name)
+            for i, current_value in enumerate(row_values):
+                # A run without this metric gets blank cells rather than a fake 0.000
+                if current_value is None:
+                    row_parts.append(f"{'':>12}")
+                    if i > 0:
+                        row_parts.append(f"{'':<18}")
+                    continue
                 
                 # Format the value with color and fixed width
-                colored_value = self._format_value(current_value, metric_name)
+                colored_value = self._format_value(current_value, self._colors)
                 row_parts.append(colored_value)
                 
                 if i > 0:  # Add change indicator for runs after first
-                    change_text = self._format_change_indicator(current_value, baseline_value, metric_name)
+                    if baseline_value is None:
+                        row_parts.append(f"{'':<18}")
+                        continue
+                    change_text = self._format_change_indicator(current_value, baseline_value, is_time, self._colors)
                     if change_text.strip():
                         row_parts.append(change_text)
                     else:
                         row_parts.append(f"{'':<18}")
             
-            print("".join(row_parts))
+            out_lines.append("".join(row_parts))
+        
+        out_lines.append("-" * separator_length)
+        sys.stdout.write("\n".join(out_lines) + "\n")
         
         # Print summary
-        print("-" * separator_length)
         self._print_optimization_summary(run_data, all_metrics)
     
     def _check_device_consistency(self, run_data: List[Dict]):
@@ -194,27 +307,34 @@ class OptimizationTracker:
         
         # Check if all devices are the same
         first_device = devices[0]
-        all_same = True
         differences = []
         
-        for i, device in enumerate(devices[1:], 1):
-            if device["model"] != first_device["model"]:
-                differences.append(f"Run {i+1}: {device['brand']} {device['model']} vs Run 1: {first_device['brand']} {first_device['model']}")
-                all_same = False
-            elif device["android_sdk"] != first_device["android_sdk"]:
-                differences.append(f"Run {i+1}: Android SDK {device['android_sdk']} vs Run 1: Android SDK {first_device['android_sdk']}")
-                all_same = False
-            elif abs(device["cpu_max_freq"] - first_device["cpu_max_freq"]) > 100000000:  # 100MHz tolerance
-                differences.append(f"Run {i+1}: CPU {device['cpu_max_freq']//1000000}MHz vs Run 1: CPU {first_device['cpu_max_freq']//1000000}MHz")
-                all_same = False
-        
-        if not all_same:
-            print(f"{Colors.YELLOW}⚠️  DEVICE INCONSISTENCY WARNING{Colors.RESET}")
-            print(f"{Colors.YELLOW}   Results from different hardware may not be comparable:{Colors.RESET}")
-            for diff in differences:
-                print(f"{Colors.YELLOW}   • {diff}{Colors.RESET}")
-            print(f"{Colors.YELLOW}   Consider running all tests on the same device for accurate comparison.{Colors.RESET}")
-            print()
+        # Equal signatures (same model, SDK and 100MHz frequency bucket) can never
+        # differ below, so only walk field by field when they disagree
+        signatures = {
+            (device["model"], device["android_sdk"], device["cpu_max_freq"] // 100000000)
+            for device in devices
+        }
+        if len(signatures) > 1:
+            for i, device in enumerate(devices[1:], 1):
+                if device["model"] != first_device["model"]:
+                    differences.append(f"Run {i+1}: {device['brand']} {device['model']} vs Run 1: {first_device['brand']} {first_device['model']}")
+                elif device["android_sdk"] != first_device["android_sdk"]:
+                    differences.append(f"Run {i+1}: Android SDK {device['android_sdk']} vs Run 1: Android SDK {first_device['android_sdk']}")
+                elif abs(device["cpu_max_freq"] - first_device["cpu_max_freq"]) > 100000000:  # 100MHz tolerance
+                    differences.append(f"Run {i+1}: CPU {device['cpu_max_freq']//1000000}MHz vs Run 1: CPU {first_device['cpu_max_freq']//1000000}MHz")
+        
+        if differences:
+            warning_lines = [
+                "⚠️  DEVICE INCONSISTENCY WARNING",
+                "   Results from different hardware may not be comparable:",
+                *[f"   • {diff}" for diff in differences],
+                "   Consider running all tests on the same device for accurate comparison."
+            ]
+            # Keep the warning after the table title when both streams share a terminal
+            sys.stdout.flush()
+            yellow, reset = self._err_colors.YELLOW, self._err_colors.RESET
+            sys.stderr.write("".join(f"{yellow}{line}{reset}\n" for line in warning_lines) + "\n")
         else:
             # Show device info for consistency
             device = first_device
@@ -228,20 +348,28 @@ class OptimizationTracker:
             print(f"❌ No optimization folder found: {optimization_name}")
             return
         
-        json_files = sorted(optimization_dir.glob("*.json"), key=lambda x: x.stat().st_mtime)
-        if not json_files:
+        runs = self._scan_runs(optimization_dir)
+        if not runs:
             print(f"📭 No runs found for optimization: {optimization_name}")
             return
         
-        print(f"\n📊 Runs for optimization: {Colors.BOLD}{optimization_name}{Colors.RESET}")
+        print(f"\n📊 Runs for optimization: {self._colors.BOLD}{optimization_name}{self._colors.RESET}")
         print("=" * 80)
         
-        for i, json_file in enumerate(json_files):
+        for i, (file_name, _, size) in enumerate(runs):
             # Extract info from filename
-            parts = json_file.stem.split('_')
-            run_number = parts[1] if len(parts) > 1 and parts[1].startswith('run') else f"run{i+1:02d}"
-            timestamp = parts[2] if len(parts) > 2 else "unknown"
-            git_commit = parts[3] if len(parts) > 3 else "unknown"
+            stem = Path(file_name).stem
+            match = _RUN_FILENAME_RE.match(stem)
+            if match:
+                run_number = match.group("run")
+                timestamp = match.group("timestamp")
+                git_commit = match.group("commit")
+            else:
+                # Files not written by collect_run: best-effort positional split
+                parts = stem.split('_')
+                run_number = parts[1] if len(parts) > 1 and parts[1].startswith('run') else f"run{i+1:02d}"
+                timestamp = parts[2] if len(parts) > 2 else "unknown"
+                git_commit = parts[3] if len(parts) > 3 else "unknown"
             
             # Format timestamp for display
             try:
@@ -250,38 +378,106 @@ class OptimizationTracker:
             except:
                 formatted_time = timestamp
             
-            file_size = json_file.stat().st_size / 1024  # KB
+            file_size = size / 1024  # KB
             
-            print(f"{run_number:>6} | {formatted_time} | {git_commit:>10} | {file_size:>6.1f}KB | {json_file.name}")
+            print(f"{run_number:>6} | {formatted_time} | {git_commit:>10} | {file_size:>6.1f}KB | {file_name}")
         
         print("=" * 80)
-        print(f"Total runs: {len(json_files)}")
+        print(f"Total runs: {len(runs)}")
+    
+    def _scan_runs(self, optimization_dir: Path) -> List[tuple]:
+        """List run files as (name, mtime_ns, size) tuples, oldest first"""
+        runs = []
+        with os.scandir(optimization_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json') and entry.is_file():
+                    stat = entry.stat()
+                    runs.append((entry.name, stat.st_mtime_ns, stat.st_size))
+        
+        runs.sort(key=lambda run: run[1])
+        return runs
     
-    def _extract_all_metrics_from_run(self, benchmark_data: Dict) -> Dict[str, tuple]:
-        """Extract all metrics from a benchmark run"""
+    def _extract_all_metrics(self, run_data: List[Dict]) -> Dict[str, tuple]:
+        """Extract all metrics across runs as metric_name -> (benchmark_name, is_time)"""
         all_metrics = {}
         
-        benchmarks = benchmark_data.get("benchmarks", [])
-        for benchmark in benchmarks:
-            benchmark_name = benchmark.get("name", "unknown")
-            metrics = benchmark.get("metrics", {})
-            
-            for metric_name in metrics.keys():
-                all_metrics[metric_name] = (benchmark_name, metric_name)
+        for benchmark_name, metric_name in run_data[0]["_metric_index"]:
+            all_metrics[metric_name] = (benchmark_name, metric_name.endswith('SumMs'))
+        
+        # Metrics introduced by later runs follow the baseline's, with no baseline value
+        for data in run_data[1:]:
+            for benchmark_name, metric_name in data["_metric_index"]:
+                if metric_name not in all_metrics:
+                    all_metrics[metric_name] = (benchmark_name, metric_name.endswith('SumMs'))
         
         return all_metrics
     
-    def _get_metric_value(self, benchmark_data: Dict, benchmark_name: str, metric_name: str) -> float:
-        """Extract metric value from benchmark data"""
-        benchmarks = benchmark_data.get("benchmarks", [])
-        for benchmark in benchmarks:
-            if benchmark.get("name") == benchmark_name:
-                metrics = benchmark.get("metrics", {})
-                if metric_name in metrics:
-                    return metrics[metric_name].get("median", 0.0)
-        return 0.0
+    def _load_index_cache(self) -> Dict[str, tuple]:
+        """Load parsed run indexes as results_dir-relative path -> (mtime_ns, size, entry)"""
+        try:
+            cache = _load_json(self.index_cache_file)
+        except Exception:
+            # Missing or unreadable cache just means every run is parsed again
+            return {}
+        
+        # Entries written by an older layout are discarded rather than misread
+        if not isinstance(cache, dict) or cache.get("version") != _INDEX_CACHE_VERSION:
+            return {}
+        
+        index_cache = {}
+        try:
+            for key, entry in cache.get("runs", {}).items():
+                # JSON has no tuple keys, so the index is stored as [benchmark, metric, median] rows
+                metric_index = {(bench, metric): median for bench, metric, median in entry["metric_index"]}
+                index_cache[key] = (
+                    entry["mtime_ns"],
+                    entry["size"],
+                    {"context": entry["context"], "metric_index": metric_index}
+                )
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return {}
+        return index_cache
+    
+    def _save_index_cache(self, index_cache: Dict[str, tuple]):
+        """Persist parsed run indexes, dropping entries for files that are gone"""
+        # One entry per path: a rewritten run replaces its entry, a deleted run is dropped
+        runs = {}
+        for key, (mtime_ns, size, entry) in index_cache.items():
+            if not (self.results_dir / key).exists():
+                continue
+            runs[key] = {
+                "mtime_ns": mtime_ns,
+                "size": size,
+                "context": entry["context"],
+                "metric_index": [
+                    [bench, metric, median] for (bench, metric), median in entry["metric_index"].items()
+                ]
+            }
+        
+        tmp_file = self.index_cache_file.with_suffix(".tmp")
+        try:
+            tmp_file.write_text(json.dumps({"version": _INDEX_CACHE_VERSION, "runs": runs}))
+            os.replace(tmp_file, self.index_cache_file)
+        except OSError as e:
+            print(f"⚠️  Warning: Could not write index cache: {e}")
     
-    def _format_value(self, value: float, metric_name: str) -> str:
+    def _index_run(self, benchmark_data: Dict) -> Dict[tuple, float]:
+        """Index metric medians by (benchmark_name, metric_name) in a single pass"""
+        index = {}
+        for benchmark in benchmark_data.get("benchmarks", []):
+            benchmark_name = benchmark.get("name")
+            for metric_name, metric in benchmark.get("metrics", {}).items():
+                # Keep the first occurrence, matching lookup order of the benchmark list
+                index.setdefault((benchmark_name, metric_name), metric.get("median", 0.0))
+        return index
+    
+    def _get_metric_value(self, benchmark_data: Dict, benchmark_name: str, metric_name: str) -> Optional[float]:
+        """Extract metric value from benchmark data, or None if the run lacks it"""
+        return benchmark_data["_metric_index"].get((benchmark_name, metric_name))
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _format_value(value: float, palette: _Palette) -> str:
         """Format a value for display with fixed width padding"""
         if value < 1:
             formatted = f"{value:.3f}"
@@ -291,25 +487,23 @@ class OptimizationTracker:
             formatted = f"{value:.1f}"
         
         # Pad to fixed width (12 characters) and add color
-        padded = f"{formatted:>12}"
-        return f"{Colors.WHITE}{padded}{Colors.RESET}"
+        return palette.value_cell.format(formatted)
     
-    def _format_change_indicator(self, current: float, baseline: float, metric_name: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _format_change_indicator(current: float, baseline: float, is_time_metric: bool, palette: _Palette) -> str:
         """Format change with absolute difference and percentage following the specified rules"""
         if baseline == 0:
             return ""
         
         if current == baseline:
-            padded_zero = f"{'0.0':>18}"
-            return f"{Colors.GRAY}{padded_zero}{Colors.RESET}"
+            return palette.change_cells["GRAY"].format('0.0')
         
         # Calculate absolute difference and percentage change
         abs_diff = current - baseline
         percent_change = (abs_diff / baseline) * 100
         
         # For time metrics, determine if this is faster (positive improvement) or slower (negative)
-        is_time_metric = metric_name.endswith('SumMs')
-        
         if is_time_metric:
             # For time metrics: lower values are better (faster)
             # So negative abs_diff = faster (positive change), positive abs_diff = slower (negative change)
@@ -325,33 +519,32 @@ class OptimizationTracker:
             if is_faster:  # Faster (improvement)
                 abs_percent = abs(percent_change)
                 if abs_percent < 15:
-                    color = Colors.GRAY  # Insignificant, likely within margin of error
+                    color = "GRAY"  # Insignificant, likely within margin of error
                 else:
-                    color = Colors.GREEN  # Meaningful speedup (≥15%)
+                    color = "GREEN"  # Meaningful speedup (≥15%)
                 arrow = "↓"
             else:  # Slower (regression)
                 abs_percent = abs(percent_change)
                 if abs_percent < 15:
-                    color = Colors.YELLOW  # Minor slowdown
+                    color = "YELLOW"  # Minor slowdown
                 elif abs_percent >= 30:
-                    color = Colors.RED  # Significant slowdown
+                    color = "RED"  # Significant slowdown
                 else:  # 15-30%
-                    color = Colors.RED  # Conservative: treat as significant
+                    color = "RED"  # Conservative: treat as significant
                 arrow = "↑"
         else:
             # For non-time metrics, use neutral coloring
             if abs(percent_change) < 5:
-                color = Colors.GRAY
+                color = "GRAY"
                 arrow = "≈"
             else:
-                color = Colors.BLUE
+                color = "BLUE"
                 arrow = "↑" if abs_diff > 0 else "↓"
         
         # Format: +/-X.X (↑/↓Y%) with fixed width padding
         sign = "+" if abs_diff > 0 else ""
         change_text = f"{sign}{abs_diff:.1f} ({arrow}{abs(percent_change):.1f}%)"
-        padded_change = f"{change_text:>18}"  # Fixed width 18 characters
-        return f"{color}{padded_change}{Colors.RESET}"
+        return palette.change_cells[color].format(change_text)  # Fixed width 18 characters
     
     def _print_optimization_summary(self, run_data: List[Dict], all_metrics: Dict):
         """Print optimization progress summary"""
@@ -362,17 +555,21 @@ class OptimizationTracker:
         first_run = run_data[0]
         latest_run = run_data[-1]
         
-        print(f"\n{Colors.BOLD}Progress Summary (Run 1 → Run {len(run_data)}):{Colors.RESET}")
+        print(f"\n{self._colors.BOLD}Progress Summary (Run 1 → Run {len(run_data)}):{self._colors.RESET}")
         
         # Find most significant improvements
         improvements = []
-        for metric_name, (benchmark_name, _) in all_metrics.items():
-            if not metric_name.endswith('SumMs'):  # Focus on time metrics
+        for metric_name, (benchmark_name, is_time) in all_metrics.items():
+            if not is_time:  # Focus on time metrics
                 continue
                 
             first_value = self._get_metric_value(first_run, benchmark_name, metric_name)
             latest_value = self._get_metric_value(latest_run, benchmark_name, metric_name)
             
+            # Metrics missing from either end run have no meaningful change
+            if first_value is None or latest_value is None:
+                continue
+            
             if first_value > 0:
                 change_percent = ((latest_value - first_value) / first_value) * 100
                 improvements.append((metric_name, first_value, latest_value, change_percent))
@@ -393,14 +590,14 @@ class OptimizationTracker:
         for metric_name, first_val, latest_val, change_pct in improvements:
             if abs(change_pct) > 1:  # Only show significant changes
                 # Use the same formatting rules as the main table
-                change_display = self._format_change_indicator(latest_val, first_val, metric_name)
+                change_display = self._format_change_indicator(latest_val, first_val, True, self._colors)  # Time metrics only
                 
                 # Truncate metric name if too long
                 display_name = metric_name if len(metric_name) <= 48 else metric_name[:45] + "..."
                 
                 # Format values with fixed width and color (consistent with main table)
-                before_val = f"{Colors.WHITE}{first_val:>12.1f}{Colors.RESET}"
-                after_val = f"{Colors.WHITE}{latest_val:>12.1f}{Colors.RESET}"
+                before_val = self._colors.value_cell_1f.format(first_val)
+                after_val = self._colors.value_cell_1f.format(latest_val)
                 
                 # Print with fixed layout
                 row_parts = [
@@ -429,11 +626,22 @@ class OptimizationTracker:
         }
     
     def _get_git_commit(self) -> str:
-        """Get current git commit hash"""
+        """Get current git commit hash (resolved once per tracker instance)"""
+        if self._git_commit is None:
+            self._git_commit = self._read_git_commit()
+        return self._git_commit
+    
+    def _read_git_commit(self) -> str:
+        """Query git for the short HEAD hash with a -dirty suffix"""
+        import subprocess
+        
         try:
+            # One porcelain v2 call reports both the HEAD oid (branch header)
+            # and the worktree state; benchmark results are excluded via pathspec
             result = subprocess.run(
-                ['git', 'rev-parse', '--short', 'HEAD'], 
-                capture_output=True, 
+                ['git', 'status', '--porcelain=v2', '--branch', '-z',
+                 '--', ':(exclude,glob)**/benchmark_results/**'],
+                capture_output=True,
                 text=True,
                 cwd=Path(__file__).parent.parent
             )
@@ -441,39 +649,34 @@ class OptimizationTracker:
             if result.returncode != 0:
                 return "unknown"
             
-            commit_hash = result.stdout.strip()
+            commit_hash = None
+            has_uncommitted = False
+            for record in result.stdout.split('\0'):
+                if record.startswith('# branch.oid '):
+                    commit_hash = record[len('# branch.oid '):]
+                elif record and not record.startswith('#'):
+                    has_uncommitted = True
             
-            # Check for uncommitted changes
-            status_result = subprocess.run(
-                ['git', 'status', '--porcelain'], 
-                capture_output=True, 
-                text=True,
-                cwd=Path(__file__).parent.parent
-            )
-            
-            if status_result.returncode == 0:
-                uncommitted_lines = status_result.stdout.strip().split('\n') if status_result.stdout.strip() else []
-                actual_changes = [line for line in uncommitted_lines if line and not 'benchmark_results/' in line]
-                has_uncommitted = bool(actual_changes)
-            else:
-                has_uncommitted = False
+            # No commits yet reports "(initial)" as the oid
+            if not commit_hash or commit_hash == "(initial)":
+                return "unknown"
             
-            return f"{commit_hash}{'-dirty' if has_uncommitted else ''}"
+            return f"{commit_hash[:7]}{'-dirty' if has_uncommitted else ''}"
             
         except Exception:
             return "unknown"
     
-    def _print_collection_summary(self, summary: Dict[str, Any], existing_runs: int):
+    def _print_collection_summary(self, summary: RunSummary, existing_runs: int):
         """Print summary of collected run"""
-        print(f"\n✅ Collected Run #{summary['run_number']} for optimization: {summary['optimization_name']}")
-        print(f"📁 Stored in: {summary['file_path']}")
-        print(f"📱 Device: {summary['device_context']['device_brand']} {summary['device_context']['device_model']}")
-        print(f"🔄 Git commit: {summary['git_commit']}")
-        print(f"🧪 Benchmarks: {summary['benchmark_count']} ({', '.join(summary['benchmark_names'])})")
+        print(f"\n✅ Collected Run #{summary.run_number} for optimization: {summary.optimization_name}")
+        print(f"📁 Stored in: {summary.file_path}")
+        print(f"📱 Device: {summary.device_brand} {summary.device_model}")
+        print(f"🔄 Git commit: {summary.git_commit}")
+        print(f"🧪 Benchmarks: {summary.benchmark_count} ({', '.join(summary.benchmark_names)})")
         
         if existing_runs > 0:
             print(f"📊 Total runs in this optimization: {existing_runs + 1}")
-            print(f"💡 Use 'compare {summary['optimization_name']}' to see progress")
+            print(f"💡 Use 'compare {summary.optimization_name}' to see progress")
 
 def main():
     import argparse